@@ -18,7 +18,18 @@ class Settings:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+    # Ingestion
+    CHUNK_INSERT_BATCH_SIZE = 1000
+
     # Video storage
     VIDEOS_DIR = "temp_videos"
 
+    # Background reaper (0 disables the reaper, retention or quota respectively).
+    # Off by default on Vercel, where instances are short-lived and scaled out.
+    REAPER_INTERVAL_SECONDS = int(os.getenv("REAPER_INTERVAL_SECONDS", 0 if os.getenv("VERCEL") else 3600))
+    REAPER_BATCH_SIZE = int(os.getenv("REAPER_BATCH_SIZE", 500))
+    REAPER_BATCH_PAUSE_SECONDS = float(os.getenv("REAPER_BATCH_PAUSE_SECONDS", 0.1))
+    SESSION_RETENTION_DAYS = int(os.getenv("SESSION_RETENTION_DAYS", 0))
+    USER_DISK_QUOTA_MB = int(os.getenv("USER_DISK_QUOTA_MB", 0))
+
 settings = Settings()
@@ -1,8 +1,12 @@
 # app/db/chat_manager.py
+from __future__ import annotations
 import uuid
-from langchain_mongodb.chat_message_histories import MongoDBChatMessageHistory
+from typing import TYPE_CHECKING
 from ..config import settings
 
+if TYPE_CHECKING:
+    from langchain_mongodb.chat_message_histories import MongoDBChatMessageHistory
+
 class ChatManagement:
     def __init__(self, connection_string, database_name, collection_name):
         self.connection_string = connection_string
@@ -15,6 +19,7 @@ class ChatManagement:
         """
         Internal: create a new MongoDBChatMessageHistory for a session_id.
         """
+        from langchain_mongodb.chat_message_histories import MongoDBChatMessageHistory
         history = MongoDBChatMessageHistory(
             session_id=session_id,
             connection_string=self.connection_string,
@@ -34,6 +39,7 @@ class ChatManagement:
         if session_id in self.chat_sessions:
             return self.chat_sessions[session_id]
         # instantiate from DB
+        from langchain_mongodb.chat_message_histories import MongoDBChatMessageHistory
         history = MongoDBChatMessageHistory(
             session_id=session_id,
             connection_string=self.connection_string,
@@ -1,19 +1,62 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING
 from ..config import settings
 
 class MongoDB:
     def __init__(self):
-        self.client = MongoClient(settings.CONNECTION_STRING)
-        self.db = self.client[settings.DATABASE_NAME]
-        self.users = self.db["users"]
-        self.videos = self.db[settings.COLLECTION_NAME]
-        # Indexes
+        # Client is created in connect(), called from the app lifespan or on first access
+        self._client = None
+        self._db = None
+
+    def connect(self):
+        if self._client is not None:
+            return
+        # connect=False defers server selection and the TLS handshake to the first operation
+        self._client = MongoClient(settings.CONNECTION_STRING, connect=False)
+        self._db = self._client[settings.DATABASE_NAME]
+
+    def create_indexes(self):
+        """
+        Build the indexes the app relies on. Idempotent; run off the request path.
+        """
         self.users.create_index("username", unique=True)
         self.users.create_index("email", unique=True)
         self.videos.create_index("video_id", unique=True)
         self.videos.create_index("user_id")
+        self.videos.create_index("last_used_at")
+        self.videos.create_index("created_at")
+        self.chunks.create_index([("session_id", ASCENDING), ("order", ASCENDING)])
+
+    @property
+    def client(self):
+        self.connect()
+        return self._client
+
+    @property
+    def db(self):
+        self.connect()
+        return self._db
+
+    @property
+    def users(self):
+        return self.db["users"]
+
+    @property
+    def videos(self):
+        return self.db[settings.COLLECTION_NAME]
+
+    @property
+    def chunks(self):
+        return self.db["chunks"]
 
     def close(self):
-        self.client.close()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._db = None
+
+mongodb = MongoDB()
 
-mongodb = MongoDB()
\ No newline at end of file
+if __name__ == "__main__":
+    # One-off setup for deployments that never run the app lifespan: python -m app.db.mongodb
+    mongodb.create_indexes()
+    mongodb.close()
@@ -1,17 +1,57 @@
 import os
-import shutil
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from .config import settings
 from .db.mongodb import mongodb
+from .services.reaper import run_reaper
 from .routes import auth, video, query, sessions
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Uvicorn only configures its own loggers; give the app's loggers (e.g. reaper reports) a handler
+app_logger = logging.getLogger("app")
+if not app_logger.handlers:
+    app_logger.addHandler(logging.StreamHandler())
+    app_logger.setLevel(logging.INFO)
+
+async def build_indexes():
+    try:
+        await asyncio.to_thread(mongodb.create_indexes)
+    except Exception:
+        logger.exception("Creating MongoDB indexes failed")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the (lazy) DB client and ensure video dir exists; the ML stack loads lazily on query/ingest
+    mongodb.connect()
+    os.makedirs(settings.VIDEOS_DIR, exist_ok=True)
+    # Index builds are Atlas round trips, so keep them off the startup path
+    indexes = asyncio.create_task(build_indexes())
+    # Retention and orphan cleanup run in the background instead of wiping videos on shutdown
+    reaper_stop = threading.Event()
+    reaper = asyncio.create_task(run_reaper(reaper_stop)) if settings.REAPER_INTERVAL_SECONDS > 0 else None
+    yield
+    if reaper:
+        # Stop the worker thread between batches and wait for it before closing the client
+        reaper_stop.set()
+        reaper.cancel()
+        with suppress(asyncio.CancelledError):
+            await reaper
+    await indexes
+    # Close DB
+    mongodb.close()
+
 app = FastAPI(
     title="RAG System API",
-    description="An API for question answering based on video content with user authentication"
+    description="An API for question answering based on video content with user authentication",
+    lifespan=lifespan
 )
 
 # CORS
@@ -33,13 +73,6 @@ app.include_router(sessions.router)
 async def root():
     return {"message": "Video Transcription and QA API"}
 
-@app.on_event("shutdown")
-def on_shutdown():
-    # Close DB
-    mongodb.close()
-    # Clean up temp videos
-    shutil.rmtree(settings.VIDEOS_DIR, ignore_errors=True)
-
 if __name__ == "__main__":
     import uvicorn
     os.environ["TOKENIZERS_PARALLELISM"] = "false"
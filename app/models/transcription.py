@@ -21,5 +21,6 @@ class VideoData(BaseModel):
     source_type: str
     source_url: Optional[str]
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: Optional[datetime] = None
     transcription: str
     size: Optional[int]
\ No newline at end of file
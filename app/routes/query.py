@@ -1,4 +1,5 @@
 # app/routes/query.py
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from ..models.transcription import QueryRequest, QueryResponse
 from ..dependencies import get_current_user
@@ -20,6 +21,8 @@ async def query_system(request: QueryRequest, current_user = Depends(get_current
         raise HTTPException(status_code=404, detail="Session not found. Please transcribe a video first.")
     if video.get("user_id") != current_user.username:
         raise HTTPException(status_code=403, detail="Not authorized to access this session.")
+    # Retention is based on last activity; mark it before the slow retriever and LLM calls
+    mongodb.videos.update_one({"video_id": request.session_id}, {"$set": {"last_used_at": datetime.utcnow()}})
 
     # Build retriever from MongoDB chunks
     retriever = get_retriever(request.session_id)
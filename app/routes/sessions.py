@@ -74,7 +74,7 @@ async def delete_session(session_id: str, current_user = Depends(get_current_use
     # Delete video metadata
     mongodb.videos.delete_one({"video_id": session_id})
     # Delete chunks
-    mongodb.db.get_collection("chunks").delete_many({"session_id": session_id})
+    mongodb.chunks.delete_many({"session_id": session_id})
     # Delete chat history
     history = chat_manager.get_chat_history(session_id)
     if history:
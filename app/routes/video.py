@@ -10,7 +10,6 @@ from ..services.transcription import process_transcription, save_video_file
 from ..services.llm import init_google_client
 from ..config import settings
 from ..db.mongodb import mongodb
-from google.genai import types
 
 router = APIRouter()
 
@@ -23,6 +22,7 @@ async def transcribe(
     Transcribe a YouTube video via Google GenAI and prepare the RAG system
     """
     try:
+        from google.genai import types
         client = init_google_client()
         content = types.Content(
             parts=[
@@ -68,6 +68,7 @@ async def upload_video(
         if not file.content_type.startswith('video/'):
             raise HTTPException(status_code=400, detail="File must be a video")
 
+        from google.genai import types
         client = init_google_client()
         content = types.Content(
             parts=[
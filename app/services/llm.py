@@ -1,17 +1,12 @@
 import os
-from google import genai
-from google.genai import types
-from .auth import settings
-from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.docstore.in_memory import InMemoryDocstore
-from langchain_community.vectorstores import FAISS
-from langchain.chains import ConversationalRetrievalChain
-from langchain_core.prompts import ChatPromptTemplate
+from functools import lru_cache
+
+# The ML stack (google-genai, langchain, sentence-transformers/torch) is imported
+# inside the functions below so that only the query and ingest paths pay for it.
 
 
 def init_google_client():
+    from google import genai
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_API_KEY not set")
@@ -22,10 +17,13 @@ def get_llm():
     api_key = os.getenv("CHATGROQ_API_KEY")
     if not api_key:
         raise ValueError("CHATGROQ_API_KEY not set")
+    from langchain_groq import ChatGroq
     return ChatGroq(model="meta-llama/llama-4-scout-17b-16e-instruct", temperature=0, max_tokens=1024, api_key=api_key)
 
 
+@lru_cache(maxsize=1)
 def get_embeddings():
+    from langchain_huggingface import HuggingFaceEmbeddings
     return HuggingFaceEmbeddings(model_name="BAAI/bge-small-en", model_kwargs={"device": "cpu"}, encode_kwargs={"normalize_embeddings": True})
 
 # reuse prompt template
@@ -48,21 +46,26 @@ User's question:
 Your response:
 """
 
-# Create a prompt template to pass the context and user input to the chain
-user_prompt = ChatPromptTemplate.from_messages(
-    [
-        ("system", prompt_template),
-        ("human", "{question}"),
-    ]
-)
+
+@lru_cache(maxsize=1)
+def get_user_prompt():
+    """Create a prompt template to pass the context and user input to the chain."""
+    from langchain_core.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", prompt_template),
+            ("human", "{question}"),
+        ]
+    )
 
 
 def create_chain(retriever):
+    from langchain.chains import ConversationalRetrievalChain
     return ConversationalRetrievalChain.from_llm(
         llm=get_llm(),
         retriever=retriever,
         return_source_documents=True,
         chain_type='stuff',
-        combine_docs_chain_kwargs={"prompt": user_prompt},
+        combine_docs_chain_kwargs={"prompt": get_user_prompt()},
         verbose=False,
     )
\ No newline at end of file
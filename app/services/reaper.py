@@ -0,0 +1,312 @@
+# app/services/reaper.py
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from ..config import settings
+from ..db.mongodb import mongodb
+from ..db.chat_manager import chat_manager
+from ..utils.helpers import chunk_list, chunk_iterable
+
+logger = logging.getLogger(__name__)
+
+# Field MongoDBChatMessageHistory uses to tag history documents with their session
+HISTORY_SESSION_KEY = "SessionId"
+
+# Lease document that lets a single instance reap at a time; it also holds the last report
+LEASE_COLLECTION = "locks"
+LEASE_ID = "reaper"
+INSTANCE_ID = str(uuid.uuid4())
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.REAPER_INTERVAL_SECONDS)
+
+
+def _acquire_lease() -> bool:
+    """
+    Take the reaper lease for one interval. Returns False if another instance holds it.
+    """
+    try:
+        mongodb.db[LEASE_COLLECTION].find_one_and_update(
+            {"_id": LEASE_ID, "expires_at": {"$lte": datetime.utcnow()}},
+            {"$set": {"owner": INSTANCE_ID, "expires_at": _lease_expiry()}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # The lease exists and has not expired
+        return False
+
+
+def _renew_lease() -> bool:
+    """
+    Push the lease expiry out by one interval. Returns False if this instance lost it.
+    """
+    result = mongodb.db[LEASE_COLLECTION].update_one(
+        {"_id": LEASE_ID, "owner": INSTANCE_ID}, {"$set": {"expires_at": _lease_expiry()}}
+    )
+    return result.matched_count == 1
+
+
+def _release_lease(started_at: datetime, report: dict) -> None:
+    """
+    Record the report and let the lease lapse one interval after the pass started,
+    or right away if the pass overran the interval.
+    """
+    leases = mongodb.db[LEASE_COLLECTION]
+    leases.update_one(
+        {"_id": LEASE_ID, "owner": INSTANCE_ID},
+        {"$set": {"expires_at": started_at + timedelta(seconds=settings.REAPER_INTERVAL_SECONDS)}}
+    )
+    leases.update_one(
+        {"_id": LEASE_ID},
+        {"$set": {"last_report": report, "last_report_at": datetime.utcnow(), "last_report_by": INSTANCE_ID}}
+    )
+
+
+class _LeasedStop:
+    """
+    Stop event for a leased pass: renews the lease between batches and reports
+    stop once shutdown is requested or the lease has been lost.
+    """
+    def __init__(self, stop: threading.Event):
+        self._stop = stop
+        self._lost = False
+        self._renewed_at = time.monotonic()
+
+    def is_set(self) -> bool:
+        if self._stop.is_set() or self._lost:
+            return True
+        if time.monotonic() - self._renewed_at >= settings.REAPER_INTERVAL_SECONDS / 3:
+            self._lost = not _renew_lease()
+            self._renewed_at = time.monotonic()
+        return self._lost
+
+    def wait(self, timeout: float) -> bool:
+        return self._stop.wait(timeout) or self.is_set()
+
+
+def _delete_in_batches(collection, query, stop: threading.Event) -> tuple[int, int]:
+    """
+    Delete documents matching query in bounded batches, pausing between them.
+    Each delete re-applies query, so documents that stopped matching since the
+    batch was read (e.g. a session queried meanwhile) are kept.
+    Returns (documents deleted, logical BSON bytes deleted).
+    """
+    deleted = deleted_bytes = 0
+    while not stop.is_set():
+        batch = list(collection.find(query, {"_id": 1, "bson_size": {"$bsonSize": "$$ROOT"}})
+                     .limit(settings.REAPER_BATCH_SIZE))
+        if not batch:
+            break
+        ids = [doc["_id"] for doc in batch]
+        result = collection.delete_many({"$and": [query, {"_id": {"$in": ids}}]})
+        if result.deleted_count:
+            kept = {doc["_id"] for doc in collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+            deleted_bytes += sum(doc["bson_size"] for doc in batch if doc["_id"] not in kept)
+        deleted += result.deleted_count
+        stop.wait(settings.REAPER_BATCH_PAUSE_SECONDS)
+    return deleted, deleted_bytes
+
+
+def _live_session_ids(session_ids) -> set:
+    """
+    Return the subset of session_ids that still have session metadata.
+    """
+    cursor = mongodb.videos.find({"video_id": {"$in": list(session_ids)}}, {"_id": 0, "video_id": 1})
+    return {doc["video_id"] for doc in cursor}
+
+
+def _orphaned_session_ids(collection, key: str):
+    """
+    Yield batches of session ids referenced in collection that have no session metadata.
+    """
+    # Sorting on the indexed key first lets Mongo answer the $group with a DISTINCT_SCAN
+    pipeline = [{"$sort": {key: 1}}, {"$group": {"_id": f"${key}"}}]
+    session_ids = (doc["_id"] for doc in collection.aggregate(pipeline) if doc["_id"] is not None)
+    for batch in chunk_iterable(session_ids, settings.REAPER_BATCH_SIZE):
+        orphans = set(batch) - _live_session_ids(batch)
+        if orphans:
+            yield list(orphans)
+
+
+def _video_files() -> dict:
+    """
+    Map session_id to file paths for every file in the video directory.
+    """
+    try:
+        names = os.listdir(settings.VIDEOS_DIR)
+    except FileNotFoundError:
+        return {}
+    files = {}
+    for name in names:
+        session_id = os.path.splitext(name)[0]
+        files.setdefault(session_id, []).append(os.path.join(settings.VIDEOS_DIR, name))
+    return files
+
+
+def _remove_file(path: str) -> int:
+    """
+    Remove a file and return its size, or 0 if it could not be removed.
+    """
+    try:
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+    except OSError:
+        return 0
+
+
+def _expire_sessions(report: dict, stop: threading.Event) -> None:
+    """
+    Delete sessions with no activity for SESSION_RETENTION_DAYS.
+    Sessions created before last_used_at was tracked fall back to created_at.
+    """
+    if settings.SESSION_RETENTION_DAYS <= 0:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=settings.SESSION_RETENTION_DAYS)
+    # Chunks, histories and files of expired sessions are removed by the orphan passes
+    deleted, deleted_bytes = _delete_in_batches(mongodb.videos, {
+        "video_id": {"$exists": True},
+        "$or": [
+            {"last_used_at": {"$lt": cutoff}},
+            {"last_used_at": {"$exists": False}, "created_at": {"$lt": cutoff}},
+        ]
+    }, stop)
+    report["sessions_expired"] += deleted
+    report["mongo_bytes_deleted"] += deleted_bytes
+
+
+def _reap_orphaned_chunks(report: dict, stop: threading.Event) -> None:
+    for batch in _orphaned_session_ids(mongodb.chunks, "session_id"):
+        if stop.is_set():
+            return
+        deleted, deleted_bytes = _delete_in_batches(mongodb.chunks, {"session_id": {"$in": batch}}, stop)
+        report["chunks_deleted"] += deleted
+        report["mongo_bytes_deleted"] += deleted_bytes
+
+
+def _reap_orphaned_histories(report: dict, stop: threading.Event) -> None:
+    histories = mongodb.db[chat_manager.collection_name]
+    for batch in _orphaned_session_ids(histories, HISTORY_SESSION_KEY):
+        if stop.is_set():
+            return
+        deleted, deleted_bytes = _delete_in_batches(histories, {HISTORY_SESSION_KEY: {"$in": batch}}, stop)
+        for session_id in batch:
+            chat_manager.chat_sessions.pop(session_id, None)
+        report["histories_deleted"] += deleted
+        report["mongo_bytes_deleted"] += deleted_bytes
+
+
+def _reap_orphaned_files(report: dict, stop: threading.Event) -> None:
+    files = _video_files()
+    for batch in chunk_list(list(files), settings.REAPER_BATCH_SIZE):
+        if stop.is_set():
+            return
+        for session_id in set(batch) - _live_session_ids(batch):
+            for path in files[session_id]:
+                size = _remove_file(path)
+                report["files_deleted"] += 1 if size else 0
+                report["disk_bytes_reclaimed"] += size
+
+
+def _enforce_disk_quotas(report: dict, stop: threading.Event) -> None:
+    """
+    Remove each user's oldest video files until their usage is within quota.
+    Session metadata, chunks and chat history are kept.
+    """
+    quota = settings.USER_DISK_QUOTA_MB * 1024 * 1024
+    if quota <= 0:
+        return
+    files = _video_files()
+    usage = {}
+    for batch in chunk_list(list(files), settings.REAPER_BATCH_SIZE):
+        cursor = mongodb.videos.find(
+            {"video_id": {"$in": batch}}, {"_id": 0, "video_id": 1, "user_id": 1, "created_at": 1}
+        )
+        for video in cursor:
+            for path in files[video["video_id"]]:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                usage.setdefault(video["user_id"], []).append((video["created_at"], path, size))
+
+    for user_id, entries in usage.items():
+        if stop.is_set():
+            return
+        total = sum(size for _, _, size in entries)
+        for _, path, _ in sorted(entries, key=lambda entry: entry[0]):
+            if total <= quota:
+                break
+            size = _remove_file(path)
+            total -= size
+            report["files_deleted"] += 1 if size else 0
+            report["disk_bytes_reclaimed"] += size
+
+
+def reap(stop: threading.Event | None = None) -> dict:
+    """
+    Run one garbage collection pass and return a report of what was removed.
+    Setting stop makes the pass return after the batch in progress.
+    """
+    stop = stop or threading.Event()
+    report = {
+        "sessions_expired": 0,
+        "chunks_deleted": 0,
+        "histories_deleted": 0,
+        "files_deleted": 0,
+        # Logical size of deleted documents; WiredTiger reuses the space but only returns it on compact
+        "mongo_bytes_deleted": 0,
+        # Size of removed video files
+        "disk_bytes_reclaimed": 0,
+    }
+    _expire_sessions(report, stop)
+    _reap_orphaned_chunks(report, stop)
+    _reap_orphaned_histories(report, stop)
+    _reap_orphaned_files(report, stop)
+    _enforce_disk_quotas(report, stop)
+    return report
+
+
+def _reap_with_lease(stop: threading.Event) -> dict | None:
+    if not _acquire_lease():
+        return None
+    started_at = datetime.utcnow()
+    report = reap(_LeasedStop(stop))
+    _release_lease(started_at, report)
+    return report
+
+
+async def run_reaper(stop: threading.Event) -> None:
+    """
+    Run reap() in a worker thread roughly every REAPER_INTERVAL_SECONDS until stop is set.
+    The first pass waits a full interval plus jitter so cold starts and workers that
+    boot together do not reap at once; the Mongo lease keeps it to one instance at a time.
+    Each report is logged and stored on the lease document (locks/reaper, last_report).
+    On cancellation the in-flight pass is stopped and awaited before returning.
+    """
+    while not stop.is_set():
+        interval = settings.REAPER_INTERVAL_SECONDS
+        await asyncio.sleep(interval + random.uniform(0, interval / 10))
+        if stop.is_set():
+            break
+        task = asyncio.ensure_future(asyncio.to_thread(_reap_with_lease, stop))
+        try:
+            report = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            stop.set()
+            await asyncio.wait([task])
+            raise
+        except Exception:
+            logger.exception("Reaper run failed")
+            continue
+        if report is not None:
+            logger.info("Reaper deleted %d Mongo bytes and reclaimed %d disk bytes: %s",
+                        report["mongo_bytes_deleted"], report["disk_bytes_reclaimed"], report)
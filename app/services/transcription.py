@@ -3,48 +3,49 @@ import os
 import uuid
 from datetime import datetime
 from fastapi import BackgroundTasks, HTTPException
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from ..services.llm import get_embeddings
 from ..config import settings
 from ..db.mongodb import mongodb
-from ..db.chat_manager import chat_manager
-from langchain_community.vectorstores import FAISS
-
-# ensure video dir exists
-os.makedirs(settings.VIDEOS_DIR, exist_ok=True)
-
-# Store text splits in MongoDB under "chunks" collection
-chunks_collection = mongodb.db.get_collection("chunks")
+from ..utils.helpers import chunk_list
 
 
 def process_transcription(transcription: str, user_id: str, title: str, source_type: str,
                           source_url: str = None, file_size: int = None) -> str:
     """
-    Split transcription into chunks, store in MongoDB, initialize chat history, and return session ID.
+    Split transcription into chunks, store in MongoDB, and return session ID.
+    Chat history is created on the first query.
     """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
     # Split text
     splitter = RecursiveCharacterTextSplitter(chunk_size=1024, chunk_overlap=20)
     splits = splitter.split_text(transcription)
 
-    # Persist session metadata
+    # Persist session metadata and chunks atomically
     session_id = str(uuid.uuid4())
-    mongodb.videos.insert_one({
+    now = datetime.utcnow()
+    video_doc = {
         "video_id": session_id,
         "user_id": user_id,
         "title": title,
         "source_type": source_type,
         "source_url": source_url,
-        "created_at": datetime.utcnow(),
+        "created_at": now,
+        "last_used_at": now,
         "transcription": transcription,
         "size": file_size
-    })
+    }
+    chunk_docs = [{"session_id": session_id, "order": i, "text": chunk} for i, chunk in enumerate(splits)]
 
-    # Store chunks for retrieval
-    chunk_docs = [{"session_id": session_id, "text": chunk} for chunk in splits]
-    chunks_collection.insert_many(chunk_docs)
+    def write_session(db_session):
+        mongodb.videos.insert_one(video_doc, session=db_session)
+        # Any write error aborts the whole transaction, so ordered=False would buy nothing here
+        for batch in chunk_list(chunk_docs, settings.CHUNK_INSERT_BATCH_SIZE):
+            mongodb.chunks.insert_many(batch, session=db_session)
 
-    # Initialize chat history in Mongo
-    chat_manager.initialize_chat_history(session_id)
+    # with_transaction retries on TransientTransactionError and UnknownTransactionCommitResult
+    with mongodb.client.start_session() as db_session:
+        db_session.with_transaction(write_session)
 
     return session_id
 
@@ -53,8 +54,11 @@ def get_retriever(session_id: str):
     """
     Build a Retriever by loading chunks from MongoDB and creating a FAISS vectorstore.
     """
+    from langchain_community.vectorstores import FAISS
+
     # Fetch stored text splits
-    docs = [doc["text"] for doc in chunks_collection.find({"session_id": session_id})]
+    cursor = mongodb.chunks.find({"session_id": session_id}, {"_id": 0, "text": 1}).sort("order", 1)
+    docs = [doc["text"] for doc in cursor]
     if not docs:
         raise HTTPException(status_code=404, detail="Session data not found. Please transcribe first.")
 
@@ -1,6 +1,14 @@
 # Generic helper functions
+from itertools import islice
 
 def chunk_list(lst, size):
     """Yield successive chunks from list."""
     for i in range(0, len(lst), size):
         yield lst[i:i+size]
+
+
+def chunk_iterable(iterable, size):
+    """Yield successive lists of up to size items from any iterable, consuming it lazily."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,52 @@
+# benchmarks/bench_import.py
+"""
+Measure cold import time of app.main and check that the ML stack stays unloaded.
+
+Each run imports the app in a fresh interpreter so nothing is cached in-process.
+Usage: python -m benchmarks.bench_import [runs]
+"""
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_community",
+    "langchain_huggingface",
+    "langchain_groq",
+    "langchain_mongodb",
+    "sentence_transformers",
+    "torch",
+    "faiss",
+    "google.genai",
+]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [run_once() for _ in range(runs)]
+    times = sorted(r["seconds"] for r in results)
+    print(f"import app.main: min {times[0]:.3f}s  median {times[len(times) // 2]:.3f}s  max {times[-1]:.3f}s")
+    loaded = sorted({m for r in results for m in r["loaded"]})
+    if loaded:
+        print(f"heavy modules loaded at import: {', '.join(loaded)}")
+        sys.exit(1)
+    print("no heavy modules loaded at import")
+
+
+if __name__ == "__main__":
+    main()
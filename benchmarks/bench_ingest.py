@@ -0,0 +1,56 @@
+# benchmarks/bench_ingest.py
+"""
+Time process_transcription for transcripts from 1k to 1M characters.
+
+Runs against the MongoDB configured in .env and removes the sessions it creates.
+Usage: python -m benchmarks.bench_ingest
+"""
+import random
+import string
+import time
+
+from app.services.transcription import process_transcription
+from app.db.mongodb import mongodb
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+USER_ID = "__bench_ingest__"
+
+
+def make_transcript(n_chars: int) -> str:
+    rng = random.Random(n_chars)
+    words = []
+    total = 0
+    while total < n_chars:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        words.append(word)
+        total += len(word) + 1
+    return " ".join(words)[:n_chars]
+
+
+def cleanup() -> None:
+    """Remove every session created by the benchmark user."""
+    session_ids = [v["video_id"] for v in mongodb.videos.find({"user_id": USER_ID}, {"video_id": 1})]
+    mongodb.chunks.delete_many({"session_id": {"$in": session_ids}})
+    mongodb.videos.delete_many({"user_id": USER_ID})
+
+
+def main():
+    mongodb.connect()
+    try:
+        # Warm-up: pays the lazy langchain import and opens pool connections before timing
+        process_transcription(make_transcript(SIZES[0]), USER_ID, "bench warm-up", source_type="bench")
+
+        print(f"{'chars':>10} {'chunks':>8} {'seconds':>10}")
+        for size in SIZES:
+            transcript = make_transcript(size)
+            start = time.perf_counter()
+            session_id = process_transcription(transcript, USER_ID, f"bench {size}", source_type="bench")
+            elapsed = time.perf_counter() - start
+            n_chunks = mongodb.chunks.count_documents({"session_id": session_id})
+            print(f"{size:>10} {n_chunks:>8} {elapsed:>10.3f}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py
+"""
+Measure cold start to the first response for GET / in a fresh interpreter.
+
+Covers importing app.main, running the lifespan startup and serving one request
+through the ASGI interface, so Mongo setup on the startup path is included.
+Usage: python -m benchmarks.bench_startup [runs]
+"""
+import json
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, os, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def main():
+    startup_done = asyncio.Event()
+    lifespan_queue = asyncio.Queue()
+    await lifespan_queue.put({"type": "lifespan.startup"})
+
+    async def lifespan_send(message):
+        if message["type"] == "lifespan.startup.complete":
+            startup_done.set()
+        elif message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(message.get("message"))
+
+    asyncio.create_task(app.main.app({"type": "lifespan", "asgi": {"version": "3.0"}},
+                                     lifespan_queue.get, lifespan_send))
+    await startup_done.wait()
+    started = time.perf_counter()
+
+    status = {}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/", "raw_path": b"/", "query_string": b"", "root_path": "",
+             "headers": [], "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80)}
+    await app.main.app(scope, receive, send)
+    responded = time.perf_counter()
+    print(json.dumps({"import": imported - start, "startup": started - imported,
+                      "first_response": responded - start, "status": status.get("code")}))
+
+asyncio.run(main())
+# Skip shutdown: it waits for the background index build, which is not part of cold start
+os._exit(0)
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [run_once() for _ in range(runs)]
+    for key in ("import", "startup", "first_response"):
+        times = sorted(r[key] for r in results)
+        print(f"{key:>15}: min {times[0]:.3f}s  median {times[len(times) // 2]:.3f}s  max {times[-1]:.3f}s")
+    statuses = {r["status"] for r in results}
+    if statuses != {200}:
+        print(f"unexpected status codes for GET /: {statuses}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+
+# app.config reads these at import time
+os.environ.setdefault("MONGO_USERNAME", "test")
+os.environ.setdefault("MONGO_PASSWORD", "test")
+os.environ.setdefault("DATABASE_NAME", "video_rag_test")
+os.environ.setdefault("COLLECTION_NAME", "videos")
+os.environ.setdefault("SECRET_KEY", "test")
+
+import bson
+import mongomock
+import pytest
+
+from app.config import settings
+from app.db import mongodb as mongodb_module
+
+
+def _find_with_bson_size(original_find):
+    """mongomock has no $bsonSize projection; compute it from the full document instead."""
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        if not projection or "bson_size" not in projection:
+            return original_find(self, filter, projection, *args, **kwargs)
+        fields = {key: value for key, value in projection.items() if key != "bson_size"}
+        docs = original_find(self, filter, *args, **kwargs)
+        return _SizedCursor(docs, fields)
+    return find
+
+
+class _SizedCursor:
+    def __init__(self, cursor, fields):
+        self._cursor = cursor
+        self._fields = fields
+
+    def limit(self, n):
+        self._cursor = self._cursor.limit(n)
+        return self
+
+    def __iter__(self):
+        for doc in self._cursor:
+            projected = {key: doc[key] for key in self._fields if key in doc}
+            projected["bson_size"] = len(bson.encode(doc))
+            yield projected
+
+
+@pytest.fixture
+def mongodb(monkeypatch, tmp_path):
+    monkeypatch.setattr(mongomock.Collection, "find", _find_with_bson_size(mongomock.Collection.find))
+    monkeypatch.setattr(mongodb_module, "MongoClient", lambda *args, **kwargs: mongomock.MongoClient())
+    monkeypatch.setattr(settings, "VIDEOS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "REAPER_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "REAPER_BATCH_PAUSE_SECONDS", 0)
+    monkeypatch.setattr(settings, "SESSION_RETENTION_DAYS", 0)
+    monkeypatch.setattr(settings, "USER_DISK_QUOTA_MB", 0)
+    db = mongodb_module.mongodb
+    db.close()
+    db.connect()
+    db.create_indexes()
+    yield db
+    db.close()
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import bson
+import mongomock
+
+from app.config import settings
+from app.db.chat_manager import chat_manager
+from app.services import reaper
+
+MB = 1024 * 1024
+
+
+def add_session(mongodb, session_id, user_id="alice", created_at=None, last_used_at=None):
+    doc = {
+        "video_id": session_id,
+        "user_id": user_id,
+        "title": session_id,
+        "source_type": "upload",
+        "created_at": created_at or datetime.utcnow(),
+        "transcription": "text",
+    }
+    if last_used_at:
+        doc["last_used_at"] = last_used_at
+    mongodb.videos.insert_one(doc)
+
+
+def add_chunks(mongodb, session_id, n=3):
+    mongodb.chunks.insert_many([{"session_id": session_id, "order": i, "text": "chunk"} for i in range(n)])
+
+
+def add_history(mongodb, session_id):
+    mongodb.db[chat_manager.collection_name].insert_one({reaper.HISTORY_SESSION_KEY: session_id, "History": "{}"})
+
+
+def add_file(session_id, size):
+    path = os.path.join(settings.VIDEOS_DIR, f"{session_id}.mp4")
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return path
+
+
+def test_orphan_passes_keep_live_sessions(mongodb, monkeypatch):
+    # Several history docs cannot share the videos collection under its unique video_id index
+    monkeypatch.setattr(chat_manager, "collection_name", "chat_histories")
+    for session_id in ["live-1", "live-2", "live-3"]:
+        add_session(mongodb, session_id)
+        add_chunks(mongodb, session_id)
+        add_history(mongodb, session_id)
+    live_file = add_file("live-1", 10)
+    for session_id in ["gone-1", "gone-2", "gone-3"]:
+        add_chunks(mongodb, session_id)
+        add_history(mongodb, session_id)
+    orphan_file = add_file("gone-1", 10)
+
+    report = reaper.reap()
+
+    assert report["chunks_deleted"] == 9
+    assert report["histories_deleted"] == 3
+    assert report["files_deleted"] == 1
+    assert report["disk_bytes_reclaimed"] == 10
+    assert report["mongo_bytes_deleted"] > 0
+    assert set(mongodb.chunks.distinct("session_id")) == {"live-1", "live-2", "live-3"}
+    histories = mongodb.db[chat_manager.collection_name]
+    assert set(histories.distinct(reaper.HISTORY_SESSION_KEY)) == {"live-1", "live-2", "live-3"}
+    assert mongodb.videos.count_documents({"video_id": {"$exists": True}}) == 3
+    assert os.path.exists(live_file)
+    assert not os.path.exists(orphan_file)
+
+
+def test_quota_removes_oldest_files_until_under_quota(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "USER_DISK_QUOTA_MB", 2)
+    now = datetime.utcnow()
+    paths = {}
+    for age, session_id in enumerate(["newest", "middle", "oldest"]):
+        add_session(mongodb, session_id, created_at=now - timedelta(days=age))
+        paths[session_id] = add_file(session_id, MB)
+    add_session(mongodb, "other-user", user_id="bob", created_at=now - timedelta(days=10))
+    other = add_file("other-user", MB)
+
+    report = reaper.reap()
+
+    assert report["files_deleted"] == 1
+    assert not os.path.exists(paths["oldest"])
+    assert os.path.exists(paths["middle"])
+    assert os.path.exists(paths["newest"])
+    assert os.path.exists(other)
+    # Only the file goes; the session is kept
+    assert mongodb.videos.find_one({"video_id": "oldest"})
+
+
+def test_expire_sessions_uses_last_activity_and_skips_histories(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_RETENTION_DAYS", 30)
+    old = datetime.utcnow() - timedelta(days=60)
+    add_session(mongodb, "stale", created_at=old)
+    add_session(mongodb, "active", created_at=old, last_used_at=datetime.utcnow())
+    add_history(mongodb, "active")
+
+    report = reaper.reap()
+
+    assert report["sessions_expired"] == 1
+    assert mongodb.videos.find_one({"video_id": "stale"}) is None
+    assert mongodb.videos.find_one({"video_id": "active"})
+    assert report["histories_deleted"] == 0
+    assert mongodb.videos.find_one({reaper.HISTORY_SESSION_KEY: "active"})
+
+
+def test_expire_keeps_session_used_during_pass(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_RETENTION_DAYS", 30)
+    old = datetime.utcnow() - timedelta(days=60)
+    add_session(mongodb, "queried", created_at=old, last_used_at=old)
+    add_session(mongodb, "stale", created_at=old, last_used_at=old)
+    original_delete_many = mongomock.Collection.delete_many
+
+    def delete_many(self, filter, *args, **kwargs):
+        # A /query lands between the reaper reading candidates and deleting them
+        mongodb.videos.update_one({"video_id": "queried"}, {"$set": {"last_used_at": datetime.utcnow()}})
+        return original_delete_many(self, filter, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.Collection, "delete_many", delete_many)
+    stale_size = len(bson.encode(mongodb.videos.find_one({"video_id": "stale"})))
+
+    report = reaper.reap()
+
+    assert report["sessions_expired"] == 1
+    assert report["mongo_bytes_deleted"] == stale_size
+    assert mongodb.videos.find_one({"video_id": "queried"})
+    assert mongodb.videos.find_one({"video_id": "stale"}) is None
+
+
+def test_stop_event_ends_pass_early(mongodb):
+    add_chunks(mongodb, "gone", n=5)
+    stop = threading.Event()
+    stop.set()
+
+    report = reaper.reap(stop)
+
+    assert report["chunks_deleted"] == 0
+    assert mongodb.chunks.count_documents({}) == 5
+
+
+def test_lease_allows_one_instance_per_interval(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "REAPER_INTERVAL_SECONDS", 3600)
+
+    assert reaper._acquire_lease()
+    assert not reaper._acquire_lease()
+
+    mongodb.db[reaper.LEASE_COLLECTION].update_one(
+        {"_id": reaper.LEASE_ID}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+    assert reaper._acquire_lease()
+
+
+def test_cancel_waits_for_running_pass(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "REAPER_INTERVAL_SECONDS", 0.01)
+    started = threading.Event()
+    finished = threading.Event()
+
+    def slow_pass(stop):
+        started.set()
+        stop.wait(5)
+        time.sleep(0.05)
+        finished.set()
+
+    monkeypatch.setattr(reaper, "_reap_with_lease", slow_pass)
+
+    async def main():
+        stop = threading.Event()
+        task = asyncio.create_task(reaper.run_reaper(stop))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        stop.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return finished.is_set()
+
+    assert asyncio.run(main())
+
+
+def test_lease_is_renewed_and_lost_lease_stops_pass(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "REAPER_INTERVAL_SECONDS", 3)
+    leases = mongodb.db[reaper.LEASE_COLLECTION]
+    assert reaper._acquire_lease()
+    first_expiry = leases.find_one({"_id": reaper.LEASE_ID})["expires_at"]
+
+    leased_stop = reaper._LeasedStop(threading.Event())
+    leased_stop._renewed_at -= 10
+    assert not leased_stop.is_set()
+    assert leases.find_one({"_id": reaper.LEASE_ID})["expires_at"] >= first_expiry
+
+    leases.update_one({"_id": reaper.LEASE_ID}, {"$set": {"owner": "another-instance"}})
+    leased_stop._renewed_at -= 10
+    assert leased_stop.is_set()
+
+
+def test_pass_records_report_and_releases_overrun_lease(mongodb, monkeypatch):
+    monkeypatch.setattr(settings, "REAPER_INTERVAL_SECONDS", 3600)
+    add_chunks(mongodb, "gone")
+    leases = mongodb.db[reaper.LEASE_COLLECTION]
+
+    report = reaper._reap_with_lease(threading.Event())
+
+    lease = leases.find_one({"_id": reaper.LEASE_ID})
+    assert lease["last_report"] == report
+    assert lease["last_report"]["chunks_deleted"] == 3
+    # Lease still spans one interval from the start of the pass
+    assert not reaper._acquire_lease()
+
+    # A pass that overran its interval frees the lease for the next instance
+    reaper._release_lease(datetime.utcnow() - timedelta(hours=2), report)
+    assert reaper._acquire_lease()
@@ -0,0 +1,112 @@
+import sys
+import types
+
+import mongomock
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db.chat_manager import chat_manager
+from app.services import transcription
+from app.services.reaper import HISTORY_SESSION_KEY
+
+
+class FakeSession:
+    """mongomock has no sessions; run the transaction callback directly."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def with_transaction(self, callback):
+        return callback(None)
+
+
+class FakeFAISS:
+    @classmethod
+    def from_texts(cls, texts, embeddings):
+        store = cls()
+        store.texts = texts
+        return store
+
+    def as_retriever(self, search_kwargs):
+        return self.texts
+
+
+@pytest.fixture
+def ingest(mongodb, monkeypatch):
+    monkeypatch.setattr(mongodb.client, "start_session", lambda: FakeSession())
+    monkeypatch.setattr(settings, "CHUNK_INSERT_BATCH_SIZE", 3)
+    batches = []
+    original_insert_many = mongomock.Collection.insert_many
+
+    def insert_many(self, documents, *args, **kwargs):
+        documents = list(documents)
+        if self.name == "chunks":
+            batches.append(len(documents))
+        return original_insert_many(self, documents, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.Collection, "insert_many", insert_many)
+    return batches
+
+
+@pytest.fixture
+def fake_faiss(monkeypatch):
+    module = types.ModuleType("langchain_community.vectorstores")
+    module.FAISS = FakeFAISS
+    monkeypatch.setitem(sys.modules, "langchain_community", types.ModuleType("langchain_community"))
+    monkeypatch.setitem(sys.modules, "langchain_community.vectorstores", module)
+    monkeypatch.setattr(transcription, "get_embeddings", lambda: None)
+
+
+def make_transcript(n_words):
+    return " ".join(f"word{i:05d}" for i in range(n_words))
+
+
+def test_ingest_batches_chunks_in_order(mongodb, ingest):
+    session_id = transcription.process_transcription(make_transcript(800), "alice", "talk", source_type="youtube")
+
+    chunks = list(mongodb.chunks.find({"session_id": session_id}).sort("order", 1))
+    n = len(chunks)
+    assert n > settings.CHUNK_INSERT_BATCH_SIZE
+    assert [chunk["order"] for chunk in chunks] == list(range(n))
+    assert sum(ingest) == n
+    assert all(size == settings.CHUNK_INSERT_BATCH_SIZE for size in ingest[:-1])
+    assert 0 < ingest[-1] <= settings.CHUNK_INSERT_BATCH_SIZE
+
+    video = mongodb.videos.find_one({"video_id": session_id})
+    assert video["user_id"] == "alice"
+    assert video["last_used_at"] == video["created_at"]
+
+
+def test_ingest_writes_no_chat_history(mongodb, ingest):
+    session_id = transcription.process_transcription(make_transcript(50), "alice", "talk", source_type="youtube")
+
+    histories = mongodb.db[chat_manager.collection_name]
+    assert histories.count_documents({HISTORY_SESSION_KEY: session_id}) == 0
+    assert session_id not in chat_manager.chat_sessions
+
+
+def test_empty_transcript_inserts_no_chunks(mongodb, ingest):
+    session_id = transcription.process_transcription("", "alice", "empty", source_type="youtube")
+
+    assert ingest == []
+    assert mongodb.videos.find_one({"video_id": session_id})
+
+
+def test_retriever_loads_texts_in_order(mongodb, fake_faiss):
+    mongodb.chunks.insert_many([
+        {"session_id": "s1", "order": 2, "text": "third"},
+        {"session_id": "s1", "order": 0, "text": "first"},
+        {"session_id": "other", "order": 0, "text": "other"},
+        {"session_id": "s1", "order": 1, "text": "second"},
+    ])
+
+    assert transcription.get_retriever("s1") == ["first", "second", "third"]
+
+
+def test_retriever_missing_session_is_404(mongodb, fake_faiss):
+    with pytest.raises(HTTPException) as exc:
+        transcription.get_retriever("missing")
+    assert exc.value.status_code == 404